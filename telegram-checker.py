@@ -1,14 +1,22 @@
 import asyncio
+import atexit
+import contextlib
 import json
 import logging
+import logging.handlers
 import os
-import pickle
-from dataclasses import dataclass, asdict
+import queue
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import random
 import re
+import aiofiles
+from aiolimiter import AsyncLimiter
 from rich.console import Console
+from rich.progress import Progress
 from rich.prompt import Prompt, Confirm
 from rich import print as rprint
 from telethon.sync import TelegramClient, errors
@@ -16,14 +24,37 @@ from telethon.tl import types
 from telethon.tl.functions.contacts import ImportContactsRequest, DeleteContactsRequest
 from telethon.tl.functions.users import GetFullUserRequest
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s", handlers=[logging.FileHandler("telegram_checker.log"), logging.StreamHandler()])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+_log_file_handler = logging.handlers.RotatingFileHandler("telegram_checker.log", maxBytes=10_000_000, backupCount=3)
+_log_file_handler.setFormatter(_log_formatter)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler, _log_stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
 logger = logging.getLogger(__name__)
 console = Console()
-CONFIG_FILE = Path("config.pkl")
+CONFIG_FILE = Path("config.json")
+PHONE_BATCH_SIZE = 100
+OLD_CONFIG_FILE = Path("config.pkl")
 PROFILE_PHOTOS_DIR = Path("profile_photos")
 RESULTS_DIR = Path("results")
 
-@dataclass
+@dataclass(slots=True)
 class TelegramUser:
     id: int
     username: Optional[str]
@@ -40,37 +71,71 @@ class TelegramUser:
     bio: Optional[str] = None
     common_chats_count: Optional[int] = None
     blocked: Optional[bool] = None
-    profile_photos: List[str] = None
+    profile_photos: List[str] = field(default_factory=list)
     privacy_restricted: bool = False
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'username': self.username,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'phone': self.phone,
+            'premium': self.premium,
+            'verified': self.verified,
+            'fake': self.fake,
+            'bot': self.bot,
+            'last_seen': self.last_seen,
+            'last_seen_exact': self.last_seen_exact,
+            'status_type': self.status_type,
+            'bio': self.bio,
+            'common_chats_count': self.common_chats_count,
+            'blocked': self.blocked,
+            'profile_photos': self.profile_photos,
+            'privacy_restricted': self.privacy_restricted
+        }
+
     @classmethod
-    async def from_user(cls, client: TelegramClient, user: types.User, phone: str = "") -> 'TelegramUser':
+    async def from_user(cls, client: TelegramClient, user: types.User, phone: str = "", fetch_full: bool = True,
+                        limiter: Optional[AsyncLimiter] = None) -> 'TelegramUser':
+        username = user.username
+        first_name = user.first_name or ""
+        last_name = user.last_name or ""
+        premium = user.premium or False
+        verified = user.verified or False
+        fake = user.fake or False
+        bot = user.bot or False
+        status_info = get_enhanced_user_status(user.status)
+
         try:
-            bio = ''
-            common_chats_count = 0
-            blocked = False
-            
-            try:
-                full_user = await client(GetFullUserRequest(user.id))
-                user_full_info = full_user.full_user
-                bio = getattr(user_full_info, 'about', '') or ''
-                common_chats_count = getattr(user_full_info, 'common_chats_count', 0)
-                blocked = getattr(user_full_info, 'blocked', False)
-            except:
-                pass
-
-            status_info = get_enhanced_user_status(user.status)
-            
+            bio = None
+            common_chats_count = None
+            blocked = None
+
+            if fetch_full:
+                bio = ''
+                common_chats_count = 0
+                blocked = False
+                try:
+                    async with (limiter if limiter is not None else contextlib.nullcontext()):
+                        full_user = await client(GetFullUserRequest(user.id))
+                    user_full_info = full_user.full_user
+                    bio = getattr(user_full_info, 'about', '') or ''
+                    common_chats_count = getattr(user_full_info, 'common_chats_count', 0)
+                    blocked = getattr(user_full_info, 'blocked', False)
+                except:
+                    pass
+
             return cls(
                 id=user.id,
-                username=user.username,
-                first_name=getattr(user, 'first_name', None) or "",
-                last_name=getattr(user, 'last_name', None) or "",
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
                 phone=phone,
-                premium=getattr(user, 'premium', False),
-                verified=getattr(user, 'verified', False),
-                fake=getattr(user, 'fake', False),
-                bot=getattr(user, 'bot', False),
+                premium=premium,
+                verified=verified,
+                fake=fake,
+                bot=bot,
                 last_seen=status_info['display_text'],
                 last_seen_exact=status_info['exact_time'],
                 status_type=status_info['status_type'],
@@ -82,17 +147,16 @@ class TelegramUser:
             )
         except Exception as e:
             logger.error(f"Error creating TelegramUser: {str(e)}")
-            status_info = get_enhanced_user_status(getattr(user, 'status', None))
             return cls(
                 id=user.id,
-                username=getattr(user, 'username', None),
-                first_name=getattr(user, 'first_name', None) or "",
-                last_name=getattr(user, 'last_name', None) or "",
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
                 phone=phone,
-                premium=getattr(user, 'premium', False),
-                verified=getattr(user, 'verified', False),
-                fake=getattr(user, 'fake', False),
-                bot=getattr(user, 'bot', False),
+                premium=premium,
+                verified=verified,
+                fake=fake,
+                bot=bot,
                 last_seen=status_info['display_text'],
                 last_seen_exact=status_info['exact_time'],
                 status_type=status_info['status_type'],
@@ -100,83 +164,90 @@ class TelegramUser:
                 profile_photos=[]
             )
 
+_STATUS_UNKNOWN = {'display_text': 'Unknown', 'exact_time': None, 'status_type': 'unknown', 'privacy_restricted': False}
+_STATUS_UNAVAILABLE = {'display_text': "Status unavailable", 'exact_time': None, 'status_type': 'unavailable', 'privacy_restricted': False}
+
+_STATUS_FIXED = {
+    types.UserStatusOnline: {'display_text': "Currently online", 'exact_time': None, 'status_type': 'online', 'privacy_restricted': False},
+    types.UserStatusRecently: {'display_text': "Last seen recently (1 second - 3 days ago)", 'exact_time': None, 'status_type': 'recently', 'privacy_restricted': True},
+    types.UserStatusLastWeek: {'display_text': "Last seen within a week (3-7 days ago)", 'exact_time': None, 'status_type': 'last_week', 'privacy_restricted': True},
+    types.UserStatusLastMonth: {'display_text': "Last seen within a month (7-30 days ago)", 'exact_time': None, 'status_type': 'last_month', 'privacy_restricted': True}
+}
+
 def get_enhanced_user_status(status: types.TypeUserStatus) -> Dict[str, Any]:
-    result = {
-        'display_text': 'Unknown',
-        'exact_time': None,
-        'status_type': 'unknown',
-        'privacy_restricted': False
-    }
-    
-    if isinstance(status, types.UserStatusOnline):
-        result.update({
-            'display_text': "Currently online",
-            'status_type': 'online',
-            'privacy_restricted': False
-        })
-    elif isinstance(status, types.UserStatusOffline):
-        exact_time = status.was_online.strftime('%Y-%m-%d %H:%M:%S UTC')
-        result.update({
-            'display_text': f"Last seen: {exact_time}",
-            'exact_time': exact_time,
-            'status_type': 'offline',
-            'privacy_restricted': False
-        })
-    elif isinstance(status, types.UserStatusRecently):
-        result.update({
-            'display_text': "Last seen recently (1 second - 3 days ago)",
-            'status_type': 'recently',
-            'privacy_restricted': True
-        })
-    elif isinstance(status, types.UserStatusLastWeek):
-        result.update({
-            'display_text': "Last seen within a week (3-7 days ago)",
-            'status_type': 'last_week',
-            'privacy_restricted': True
-        })
-    elif isinstance(status, types.UserStatusLastMonth):
-        result.update({
-            'display_text': "Last seen within a month (7-30 days ago)",
-            'status_type': 'last_month',
-            'privacy_restricted': True
-        })
-    elif status is None:
-        result.update({
-            'display_text': "Status unavailable",
-            'status_type': 'unavailable'
-        })
-    
-    return result
+    if status is None:
+        return _STATUS_UNAVAILABLE
+    fixed = _STATUS_FIXED.get(type(status))
+    if fixed is not None:
+        return fixed
+    if type(status) is types.UserStatusOffline:
+        exact_time = status.was_online.isoformat(sep=' ', timespec='seconds')
+        return {'display_text': f"Last seen: {exact_time}", 'exact_time': exact_time, 'status_type': 'offline', 'privacy_restricted': False}
+    return _STATUS_UNKNOWN
 
+def _dumps_indented(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+async def _stream_writer(queue: asyncio.Queue, stream_file: Path):
+    async with aiofiles.open(stream_file, 'w') as f:
+        while True:
+            item = await queue.get()
+            if item is None: break
+            await f.write(json.dumps(item) + '\n')
+            await f.flush()
+
+_PHONE_STRIP = re.compile(r'[^\d+]')
+_PHONE_OK = re.compile(r'^\+\d{10,15}$')
+_USERNAME_OK = re.compile(r'^[A-Za-z]\w{3,30}[A-Za-z0-9]$')
+
+@lru_cache(maxsize=4096)
 def validate_phone_number(phone: str) -> str:
-    phone = re.sub(r'[^\d+]', '', phone.strip())
+    phone = _PHONE_STRIP.sub('', phone.strip())
     if not phone.startswith('+'): phone = '+' + phone
-    if not re.match(r'^\+\d{10,15}$', phone): raise ValueError(f"Invalid phone number format: {phone}")
+    if not _PHONE_OK.match(phone): raise ValueError(f"Invalid phone number format: {phone}")
     return phone
 
 def validate_username(username: str) -> str:
     username = username.strip().lstrip('@')
-    if not re.match(r'^[A-Za-z]\w{3,30}[A-Za-z0-9]$', username): raise ValueError(f"Invalid username format: {username}")
+    if not _USERNAME_OK.match(username): raise ValueError(f"Invalid username format: {username}")
     return username
 
 class TelegramChecker:
     def __init__(self):
         self.config = self.load_config()
         self.client = None
+        self._sem = asyncio.Semaphore(self.config.get('concurrency', 8))
+        self._rl = AsyncLimiter(self.config.get('rate_limit', 20), 1)
+        self._entity_cache: Dict[Any, types.User] = {}
+        self._dl_sem = asyncio.BoundedSemaphore(self.config.get('download_concurrency', 64))
+        self._completed: set = set()
+        self._fetch_full = self.config.get('fetch_full', True)
         PROFILE_PHOTOS_DIR.mkdir(exist_ok=True)
         RESULTS_DIR.mkdir(exist_ok=True)
 
     def load_config(self) -> dict:
+        if OLD_CONFIG_FILE.exists() and not CONFIG_FILE.exists():
+            try:
+                import pickle
+                with open(OLD_CONFIG_FILE, 'rb') as f: config = pickle.load(f)
+                CONFIG_FILE.write_text(json.dumps(config))
+                OLD_CONFIG_FILE.unlink()
+                return config
+            except Exception as e:
+                logger.error(f"Error migrating config: {e}")
+                return {}
         if CONFIG_FILE.exists():
             try:
-                with open(CONFIG_FILE, 'rb') as f: return pickle.load(f)
+                return json.loads(CONFIG_FILE.read_text())
             except Exception as e:
                 logger.error(f"Error loading config: {e}")
                 return {}
         return {}
 
     def save_config(self):
-        with open(CONFIG_FILE, 'wb') as f: pickle.dump(self.config, f)
+        CONFIG_FILE.write_text(json.dumps(self.config))
 
     async def initialize(self):
         if not self.config.get('api_id'):
@@ -187,7 +258,10 @@ class TelegramChecker:
             self.config['phone'] = validate_phone_number(Prompt.ask("Enter your phone number (with country code)"))
             self.save_config()
 
-        self.client = TelegramClient('telegram_checker_session', self.config['api_id'], self.config['api_hash'])
+        self.client = TelegramClient(
+            'telegram_checker_session', self.config['api_id'], self.config['api_hash'],
+            receive_updates=False, flood_sleep_threshold=60, connection_retries=5, retry_delay=1,
+            request_retries=5, auto_reconnect=True)
         await self.client.connect()
         
         if not await self.client.is_user_authorized():
@@ -201,99 +275,226 @@ class TelegramChecker:
 
     async def download_all_profile_photos(self, user: types.User, user_data: TelegramUser):
         try:
-            photos = await self.client.get_profile_photos(user)
+            async with self._rl:
+                photos = await self.client.get_profile_photos(user)
             if not photos: return
-            user_data.profile_photos = []
-            for i, photo in enumerate(photos):
-                identifier = user_data.phone if user_data.phone else user_data.username
-                photo_path = PROFILE_PHOTOS_DIR / f"{user.id}_{identifier}_photo_{i}.jpg"
-                await self.client.download_media(photo, file=photo_path)
-                user_data.profile_photos.append(str(photo_path))
+            identifier = user_data.phone if user_data.phone else user_data.username
+            paths = [PROFILE_PHOTOS_DIR / f"{user.id}_{identifier}_photo_{photo.id}.jpg" for photo in photos]
+            sem = asyncio.Semaphore(4)
+
+            async def _download(photo, path):
+                if path.exists() and path.stat().st_size > 0: return
+                async with sem, self._dl_sem:
+                    blob = await self.client.download_media(photo, file=bytes)
+                if blob:
+                    await asyncio.to_thread(path.write_bytes, blob)
+
+            await asyncio.gather(*[_download(photo, path) for photo, path in zip(photos, paths)], return_exceptions=True)
+            user_data.profile_photos = [str(path) for path in paths if path.exists()]
         except Exception as e:
             logger.error(f"Error downloading profile photos for {user.id}: {str(e)}")
 
-    async def check_phone_number(self, phone: str) -> Optional[TelegramUser]:
-        try:
-            phone = validate_phone_number(phone)
+    async def _lookup_username(self, username: str) -> Optional[TelegramUser]:
+        user = self._entity_cache.get(username)
+        if user is None:
+            async with self._rl:
+                user = await self.client.get_entity(username)
+            if isinstance(user, types.User):
+                self._entity_cache[username] = self._entity_cache[user.id] = user
+        if not isinstance(user, types.User): return None
+        telegram_user = await TelegramUser.from_user(self.client, user, "", fetch_full=self._fetch_full, limiter=self._rl)
+        await self.download_all_profile_photos(user, telegram_user)
+        return telegram_user
+
+    async def check_username(self, username: str) -> Optional[TelegramUser]:
+        async with self._sem:
             try:
-                user = await self.client.get_entity(phone)
-                telegram_user = await TelegramUser.from_user(self.client, user, phone)
-                await self.download_all_profile_photos(user, telegram_user)
-                return telegram_user
-            except:
-                contact = types.InputPhoneContact(client_id=0, phone=phone, first_name="Test", last_name="User")
-                result = await self.client(ImportContactsRequest([contact]))
-                
-                if not result.users: return None
-                
-                user = result.users[0]
+                username = validate_username(username)
                 try:
-                    full_user = await self.client.get_entity(user.id)
-                    await self.client(DeleteContactsRequest(id=[user.id]))
-                    telegram_user = await TelegramUser.from_user(self.client, full_user, phone)
-                    await self.download_all_profile_photos(full_user, telegram_user)
-                    return telegram_user
-                finally:
+                    return await self._lookup_username(username)
+                except errors.FloodWaitError as e:
+                    logger.warning(f"Flood wait of {e.seconds}s while checking {username}, backing off and retrying")
+                    await asyncio.sleep(e.seconds + random.uniform(0, 1))
+                    return await self._lookup_username(username)
+            except ValueError as e:
+                logger.error(f"Invalid username {username}: {str(e)}")
+                return None
+            except errors.UsernameNotOccupiedError:
+                logger.error(f"Username {username} not found")
+                return None
+            except Exception as e:
+                logger.error(f"Error checking username {username}: {str(e)}")
+                return None
+
+    def load_resume(self, stream_file: str):
+        self._completed = set()
+        if not stream_file: return
+        try:
+            with open(stream_file) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line: continue
                     try:
-                        await self.client(DeleteContactsRequest(id=[user.id]))
-                    except:
-                        pass
-        except Exception as e:
-            logger.error(f"Error checking {phone}: {str(e)}")
-            return None
+                        self._completed.update(json.loads(line).keys())
+                    except json.JSONDecodeError:
+                        continue
+            console.print(f"[green]Loaded {len(self._completed)} completed entries from {stream_file}[/green]")
+        except FileNotFoundError:
+            console.print("[red]Resume file not found![/red]")
+
+    def _open_stream(self):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        stream_file = RESULTS_DIR / f"results_{timestamp}.jsonl"
+        queue = asyncio.Queue()
+        writer = asyncio.create_task(_stream_writer(queue, stream_file))
+        return queue, writer, stream_file
+
+    async def check_phone_batch(self, phones: List[str]) -> Dict[str, Optional[TelegramUser]]:
+        users: Dict[str, types.User] = {}
+        pending: List[str] = []
+        for phone in phones:
+            cached = self._entity_cache.get(phone)
+            if cached is not None:
+                users[phone] = cached
+            else:
+                pending.append(phone)
+
+        imported_ids: List[int] = []
+        if pending:
+            contacts = [types.InputPhoneContact(client_id=i, phone=p, first_name="Test", last_name="User") for i, p in enumerate(pending)]
+            async with self._rl:
+                result = await self.client(ImportContactsRequest(contacts))
+            by_id = {u.id: u for u in result.users}
+            for imported in result.imported:
+                user = by_id.get(imported.user_id)
+                if user is None: continue
+                phone = pending[imported.client_id]
+                users[phone] = user
+                self._entity_cache[phone] = self._entity_cache[user.id] = user
+                imported_ids.append(user.id)
+
+        async def _build(phone, user):
+            async with self._sem:
+                telegram_user = await TelegramUser.from_user(self.client, user, phone, fetch_full=self._fetch_full, limiter=self._rl)
+                await self.download_all_profile_photos(user, telegram_user)
+                return phone, telegram_user
 
-    async def check_username(self, username: str) -> Optional[TelegramUser]:
         try:
-            username = validate_username(username)
-            user = await self.client.get_entity(username)
-            if not isinstance(user, types.User): return None
-            telegram_user = await TelegramUser.from_user(self.client, user, "")
-            await self.download_all_profile_photos(user, telegram_user)
-            return telegram_user
+            built = await asyncio.gather(*[_build(phone, user) for phone, user in users.items()])
+        finally:
+            if imported_ids:
+                try:
+                    async with self._rl:
+                        await self.client(DeleteContactsRequest(id=imported_ids))
+                except:
+                    pass
+
+        results: Dict[str, Optional[TelegramUser]] = {phone: None for phone in phones}
+        results.update(dict(built))
+        return results
+
+    async def _check_one_username(self, username: str) -> tuple:
+        try:
+            user = await self.check_username(username)
+            return username, user.to_dict() if user else {"error": "No Telegram account found"}
         except ValueError as e:
-            logger.error(f"Invalid username {username}: {str(e)}")
-            return None
-        except errors.UsernameNotOccupiedError:
-            logger.error(f"Username {username} not found")
-            return None
+            return username, {"error": str(e)}
         except Exception as e:
-            logger.error(f"Error checking username {username}: {str(e)}")
-            return None
+            return username, {"error": f"Unexpected error: {str(e)}"}
 
     async def process_phones(self, phones: List[str]) -> dict:
         results = {}
+        phones = [p.strip() for p in phones if p.strip()]
         total_phones = len(phones)
         console.print(f"\n[cyan]Processing {total_phones} phone numbers...[/cyan]")
-        
-        for i, phone in enumerate(phones, 1):
+
+        norm_map: Dict[str, str] = {}
+        for phone in dict.fromkeys(phones):
             try:
-                phone = phone.strip()
-                if not phone: continue
-                console.print(f"[cyan]Checking {phone} ({i}/{total_phones})[/cyan]")
-                user = await self.check_phone_number(phone)
-                results[phone] = asdict(user) if user else {"error": "No Telegram account found"}
+                norm_map[phone] = validate_phone_number(phone)
             except ValueError as e:
                 results[phone] = {"error": str(e)}
-            except Exception as e:
-                results[phone] = {"error": f"Unexpected error: {str(e)}"}
+        unique = list(dict.fromkeys(norm_map.values()))
+        if self._completed:
+            skipped = sum(1 for norm in unique if norm in self._completed)
+            if skipped:
+                console.print(f"[cyan]Skipping {skipped} already-completed numbers[/cyan]")
+                unique = [norm for norm in unique if norm not in self._completed]
+        total_unique = len(unique)
+        if total_unique < total_phones:
+            console.print(f"[cyan]{total_unique} unique numbers after deduplication[/cyan]")
+
+        per_unique: Dict[str, dict] = dict.fromkeys(unique)
+        queue, writer, stream_file = self._open_stream()
+        try:
+            with Progress(console=console) as progress:
+                bar = progress.add_task("Checking phone numbers", total=total_unique)
+                for start in range(0, total_unique, PHONE_BATCH_SIZE):
+                    chunk = unique[start:start + PHONE_BATCH_SIZE]
+                    try:
+                        try:
+                            batch = await self.check_phone_batch(chunk)
+                        except errors.FloodWaitError as e:
+                            logger.warning(f"Flood wait of {e.seconds}s while importing contacts, backing off and retrying")
+                            await asyncio.sleep(e.seconds + random.uniform(0, 1))
+                            batch = await self.check_phone_batch(chunk)
+                        for norm in chunk:
+                            user = batch.get(norm)
+                            per_unique[norm] = user.to_dict() if user else {"error": "No Telegram account found"}
+                    except Exception as e:
+                        logger.error(f"Error checking phone batch: {str(e)}")
+                        for norm in chunk:
+                            per_unique[norm] = {"error": f"Unexpected error: {str(e)}"}
+                    for norm in chunk:
+                        progress.update(bar, advance=1, description=f"Checked {norm}")
+                        await queue.put({norm: per_unique[norm]})
+        finally:
+            await queue.put(None)
+            await writer
+            self._completed = set()
+        console.print(f"[green]Streamed results to {stream_file}[/green]")
+        results.update({phone: per_unique[norm] for phone, norm in norm_map.items() if per_unique.get(norm) is not None})
         return results
 
     async def process_usernames(self, usernames: List[str]) -> dict:
         results = {}
+        usernames = [u.strip() for u in usernames if u.strip()]
         total_usernames = len(usernames)
         console.print(f"\n[cyan]Processing {total_usernames} usernames...[/cyan]")
-        
-        for i, username in enumerate(usernames, 1):
+
+        norm_map: Dict[str, str] = {}
+        for username in dict.fromkeys(usernames):
             try:
-                username = username.strip()
-                if not username: continue
-                console.print(f"[cyan]Checking {username} ({i}/{total_usernames})[/cyan]")
-                user = await self.check_username(username)
-                results[username] = asdict(user) if user else {"error": "No Telegram account found"}
+                norm_map[username] = validate_username(username).lower()
             except ValueError as e:
                 results[username] = {"error": str(e)}
-            except Exception as e:
-                results[username] = {"error": f"Unexpected error: {str(e)}"}
+        unique = list(dict.fromkeys(norm_map.values()))
+        if self._completed:
+            skipped = sum(1 for norm in unique if norm in self._completed)
+            if skipped:
+                console.print(f"[cyan]Skipping {skipped} already-completed usernames[/cyan]")
+                unique = [norm for norm in unique if norm not in self._completed]
+        total_unique = len(unique)
+        if total_unique < total_usernames:
+            console.print(f"[cyan]{total_unique} unique usernames after deduplication[/cyan]")
+
+        per_unique: Dict[str, dict] = dict.fromkeys(unique)
+        queue, writer, stream_file = self._open_stream()
+        tasks = [asyncio.create_task(self._check_one_username(username)) for username in unique]
+        try:
+            with Progress(console=console) as progress:
+                bar = progress.add_task("Checking usernames", total=total_unique)
+                for task in asyncio.as_completed(tasks):
+                    username, result = await task
+                    progress.update(bar, advance=1, description=f"Checked {username}")
+                    per_unique[username] = result
+                    await queue.put({username: result})
+        finally:
+            await queue.put(None)
+            await writer
+            self._completed = set()
+        console.print(f"[green]Streamed results to {stream_file}[/green]")
+        results.update({username: per_unique[norm] for username, norm in norm_map.items() if per_unique.get(norm) is not None})
         return results
 
 def display_enhanced_results(results: dict):
@@ -328,7 +529,7 @@ def display_enhanced_results(results: dict):
             if data.get('blocked'):
                 status_line += "\n  🚫 User has blocked you"
             
-            if data.get('common_chats_count', 0) > 0:
+            if (data.get('common_chats_count') or 0) > 0:
                 status_line += f"\n  👥 Common chats: {data['common_chats_count']}"
             
             if data.get('profile_photos'):
@@ -337,10 +538,39 @@ def display_enhanced_results(results: dict):
             console.print(status_line)
             console.print()
 
+def load_results(path) -> dict:
+    data = Path(path).read_bytes()
+    if str(path).endswith('.zst'):
+        if zstd is None: raise RuntimeError("zstandard is required to read .zst results files")
+        data = zstd.ZstdDecompressor().decompress(data)
+    return json.loads(data)
+
+async def write_and_display_results(results: dict, verbose: bool = False, compress: bool = False):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = RESULTS_DIR / f"results_{timestamp}.json"
+
+    def _write():
+        data = _dumps_indented(results)
+        if compress and zstd is not None:
+            path = output_file.with_suffix('.json.zst')
+            path.write_bytes(zstd.ZstdCompressor(level=3).compress(data))
+        else:
+            path = output_file
+            path.write_bytes(data)
+        return path, data
+
+    saved_file, data = await asyncio.to_thread(_write)
+    console.print(f"\n[green]Results saved to {saved_file}[/green]")
+    display_enhanced_results(results)
+
+    if verbose:
+        console.print("\n[bold cyan]Detailed Results (JSON):[/bold cyan]")
+        console.print(data.decode())
+
 async def main():
     checker = TelegramChecker()
     await checker.initialize()
-    
+
     while True:
         rprint("\n[bold cyan]Telegram Account Checker[/bold cyan]")
         rprint("\n1. Check phone numbers from input")
@@ -351,15 +581,16 @@ async def main():
         rprint("6. Exit")
         
         choice = Prompt.ask("\nSelect an option", choices=["1", "2", "3", "4", "5", "6"])
-        
+        results = None
+
         if choice == "1":
             phones = [p.strip() for p in Prompt.ask("Enter phone numbers (comma-separated)").split(",")]
             results = await checker.process_phones(phones)
         elif choice == "2":
             file_path = Prompt.ask("Enter the path to your phone numbers file")
             try:
-                with open(file_path, 'r') as f:
-                    phones = [line.strip() for line in f if line.strip()]
+                phones = [s for line in Path(file_path).read_text().splitlines() if (s := line.strip())]
+                checker.load_resume(Prompt.ask("Path to a previous results .jsonl to resume from (optional)", default=""))
                 results = await checker.process_phones(phones)
             except FileNotFoundError:
                 console.print("[red]File not found![/red]")
@@ -370,8 +601,8 @@ async def main():
         elif choice == "4":
             file_path = Prompt.ask("Enter the path to your usernames file")
             try:
-                with open(file_path, 'r') as f:
-                    usernames = [line.strip() for line in f if line.strip()]
+                usernames = [s for line in Path(file_path).read_text().splitlines() if (s := line.strip())]
+                checker.load_resume(Prompt.ask("Path to a previous results .jsonl to resume from (optional)", default=""))
                 results = await checker.process_usernames(usernames)
             except FileNotFoundError:
                 console.print("[red]File not found![/red]")
@@ -385,22 +616,17 @@ async def main():
             continue
         else:
             break
-            
-        if 'results' in locals():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = RESULTS_DIR / f"results_{timestamp}.json"
-            
-            with open(output_file, 'w') as f:
-                json.dump(results, f, indent=2)
-                
-            console.print(f"\n[green]Results saved to {output_file}[/green]")
-            display_enhanced_results(results)
-            
-            console.print("\n[bold cyan]Detailed Results (JSON):[/bold cyan]")
-            formatted_json = json.dumps(results, indent=2)
-            console.print(formatted_json)
+
+        if results is not None:
+            await write_and_display_results(results, verbose=checker.config.get('verbose', False),
+                                            compress=checker.config.get('compress_results', False))
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     try:
         asyncio.run(main())
     except KeyboardInterrupt: